@@ -1,13 +1,9 @@
-import json
 import os
 from datetime import datetime
 
 import yt_dlp
 
-# Load config
-config_file_path = 'config/config.json'
-with open(config_file_path, 'r') as config_file:
-    config = json.load(config_file)
+from config_loader import config
 
 
 
@@ -0,0 +1,99 @@
+import json
+import os
+import pickle
+
+# Path to the central configuration file
+config_file_path = 'config/config.json'
+
+
+
+def load_config() -> dict:
+    """
+    Load the central configuration file.
+
+    The parsed dictionary is cached next to the config file as a
+    pickle, which is cheaper to load than re-parsing the JSON on
+    every startup. The cache is rebuilt whenever config.json is
+    newer than it.
+
+    Returns
+    -------
+    dict:
+        Dictionary containing all configuration values
+    """
+    cache_file_path = config_file_path + '.pickle'
+
+    # Use the cached pickle if it is at least as new as the config.
+    # Any unreadable cache (missing, truncated, corrupt) just falls
+    # through to re-parsing the JSON below
+    try:
+        if (os.path.getmtime(cache_file_path)
+                >= os.path.getmtime(config_file_path)):
+            with open(cache_file_path, 'rb') as cache_file:
+                return pickle.load(cache_file)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        pass
+
+    # Otherwise parse the JSON and refresh the cache. The pickle is
+    # written to a temp file and renamed into place, so a crash
+    # mid-write can never leave a truncated cache behind
+    with open(config_file_path, 'r') as config_file:
+        parsed_config = json.load(config_file)
+    try:
+        temp_cache_file_path = cache_file_path + '.temp'
+        with open(temp_cache_file_path, 'wb') as cache_file:
+            pickle.dump(parsed_config, cache_file)
+        os.replace(temp_cache_file_path, cache_file_path)
+    except OSError:
+        pass
+    return parsed_config
+
+
+
+# Parsed once at import. Modules importing this share the same
+# dictionary instead of re-parsing config.json themselves.
+config = load_config()
+
+
+
+# Paths derived from the config, joined once at import instead of
+# repeatedly at runtime. Named after the config entry they resolve.
+download_directory_in_progress = os.path.join(
+    config["download_directory_main"],
+    config["download_directory_in_progress"])
+download_directory_in_progress_active = os.path.join(
+    download_directory_in_progress,
+    config["download_directory_in_progress_active"])
+download_directory_in_progress_paused = os.path.join(
+    download_directory_in_progress,
+    config["download_directory_in_progress_paused"])
+download_directory_in_progress_failed = os.path.join(
+    download_directory_in_progress,
+    config["download_directory_in_progress_failed"])
+
+download_directory_videos = os.path.join(
+    config["download_directory_main"],
+    config["download_directory_videos"])
+download_directory_subtitles = os.path.join(
+    config["download_directory_main"],
+    config["download_directory_subtitles"])
+
+download_directory_data = os.path.join(
+    config["download_directory_main"],
+    config["download_directory_data"])
+download_directory_data_info_json = os.path.join(
+    download_directory_data,
+    config["download_directory_data_info_json"])
+download_directory_data_logs = os.path.join(
+    download_directory_data,
+    config["download_directory_data_logs"])
+
+download_archive_file = os.path.join(
+    download_directory_data,
+    config["download_archive_file"])
+download_failed_list = os.path.join(
+    download_directory_data,
+    config["download_failed_list"])
+download_to_process_list = os.path.join(
+    download_directory_data,
+    config["download_to_process_list"])
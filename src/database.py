@@ -3,10 +3,7 @@ import datetime
 import json
 import os
 
-# Load config
-config_file_path = 'config/config.json'
-with open(config_file_path, 'r') as config_file:
-    config = json.load(config_file)
+from config_loader import config
 
 
 
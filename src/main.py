@@ -1,22 +1,31 @@
 import argparse
 import json
 import logging
+import logging.handlers
 import os
 import re
 import shutil
 import sys
+import time
 from datetime import datetime
-
-import yt_dlp
+from pathlib import Path
 
 import database
-import downloader
 import subtitles_embedding
-
-# Load config
-config_file_path = 'config/config.json'
-with open(config_file_path, 'r') as config_file:
-    config = json.load(config_file)
+from config_loader import (
+    config,
+    download_directory_in_progress,
+    download_directory_in_progress_active,
+    download_directory_in_progress_paused,
+    download_directory_in_progress_failed,
+    download_directory_videos,
+    download_directory_subtitles,
+    download_directory_data,
+    download_directory_data_info_json,
+    download_directory_data_logs,
+    download_archive_file,
+    download_failed_list,
+    download_to_process_list)
 
 
 
@@ -25,90 +34,39 @@ def _check_file_structure() -> None:
     Ensures that the folder structure exists 
     as specified in the config.
     """
-    # Check main directory
-    if not os.path.exists(config["download_directory_main"]):
-        os.mkdir(config["download_directory_main"])
-
-    # Check in_progress directory
-    download_directory_in_progress = os.path.join(
-        config["download_directory_main"],
-        config["download_directory_in_progress"])
-    if not os.path.exists(download_directory_in_progress):
-        os.mkdir(download_directory_in_progress)
-    # Check in_progress subdirectories
-    download_directory_in_progress_active = os.path.join(
-        config["download_directory_main"],
-        config["download_directory_in_progress"],
-        config["download_directory_in_progress_active"])
-    download_directory_in_progress_paused = os.path.join(
-        config["download_directory_main"],
-        config["download_directory_in_progress"],
-        config["download_directory_in_progress_paused"])
-    download_directory_in_progress_failed = os.path.join(
-        config["download_directory_main"],
-        config["download_directory_in_progress"],
-        config["download_directory_in_progress_failed"])
-    if not os.path.exists(download_directory_in_progress_active):
-        os.mkdir(download_directory_in_progress_active)
-    if not os.path.exists(download_directory_in_progress_paused):
-        os.mkdir(download_directory_in_progress_paused)
-    if not os.path.exists(download_directory_in_progress_failed):
-        os.mkdir(download_directory_in_progress_failed)
-
-    # Check directories for finished downloads
-    download_directory_videos = os.path.join(
-        config["download_directory_main"],
-        config["download_directory_videos"])
-    if not os.path.exists(download_directory_videos):
-        os.mkdir(download_directory_videos)
-
-    download_directory_subtitles = os.path.join(
-        config["download_directory_main"],
-        config["download_directory_subtitles"])
-    if not os.path.exists(download_directory_subtitles):
-        os.mkdir(download_directory_subtitles)
-
-    # Check data directory
-    download_directory_data = os.path.join(
-        config["download_directory_main"],
-        config["download_directory_data"])
-    if not os.path.exists(download_directory_data):
-        os.mkdir(download_directory_data)
-    # Check data subdirectories
-    download_directory_data_info_json = os.path.join(
-        config["download_directory_main"],
-        config["download_directory_data"],
-        config["download_directory_data_info_json"])
-    download_directory_data_logs = os.path.join(
+    # Check all required directories
+    required_directories = [
         config["download_directory_main"],
-        config["download_directory_data"],
-        config["download_directory_data_logs"])
-    if not os.path.exists(download_directory_data_info_json):
-        os.mkdir(download_directory_data_info_json)
-    if not os.path.exists(download_directory_data_logs):
-        os.mkdir(download_directory_data_logs)
+        # in_progress directory and subdirectories
+        download_directory_in_progress,
+        download_directory_in_progress_active,
+        download_directory_in_progress_paused,
+        download_directory_in_progress_failed,
+        # Directories for finished downloads
+        download_directory_videos,
+        download_directory_subtitles,
+        # Data directory and subdirectories
+        download_directory_data,
+        download_directory_data_info_json,
+        download_directory_data_logs
+    ]
+    for directory in required_directories:
+        os.makedirs(directory, exist_ok=True)
 
     # Check for relevant information files
-    download_archive_file = os.path.join(
-        config["download_directory_main"],
-        config["download_directory_data"],
-        config["download_archive_file"])
-    download_failed_list = os.path.join(
-        config["download_directory_main"],
-        config["download_directory_data"],
-        config["download_failed_list"])
-    download_to_process_list = os.path.join(
-        config["download_directory_main"],
-        config["download_directory_data"],
-        config["download_to_process_list"])
-    if not os.path.exists(download_archive_file):
-        with open(download_archive_file, 'w'):
-            pass
-    if not os.path.exists(download_failed_list):
-        with open(download_failed_list, 'w'):
-            pass
-    if not os.path.exists(download_to_process_list):
-        with open(download_to_process_list, 'w'):
+    required_files = [
+        download_archive_file,
+        download_failed_list,
+        download_to_process_list
+    ]
+    for file_path in required_files:
+        # O_CREAT|O_EXCL creates a missing file in a single syscall,
+        # without a separate existence check beforehand. The explicit
+        # 0o666 mode gives the same umask-filtered permissions as a
+        # regular open() would, instead of os.open's executable default
+        try:
+            os.close(os.open(file_path, os.O_CREAT | os.O_EXCL, 0o666))
+        except FileExistsError:
             pass
 
 
@@ -128,38 +86,53 @@ def _setup_logger(print_to_console:bool=False) -> logging.Logger:
     logging.Logger:
         Logger that allows logging to log file
     """
-    # Create a timestamp for the filename
-    timestamp = datetime.now().strftime("%Y.%m.%d_%H.%M.%S")
-    log_filename = f"youtube_archiving_log_{timestamp}.txt"
+    # Create a timestamp and name the log file after its date only.
+    # FileHandler appends by default, so repeated runs on the same
+    # day share one log file instead of creating a new file each run
+    timestamp = time.strftime("%Y.%m.%d_%H.%M.%S", time.localtime())
+    log_filename = f"youtube_archiving_log_{timestamp[:10]}.txt"
 
     # Define log-file path
-    log_file = os.path.join(
-        config["download_directory_main"],
-        config["download_directory_data"],
-        config["download_directory_data_logs"],
-        log_filename
-    )
-
-    # Define log-file handlers
-    handlers = [logging.FileHandler(log_file, encoding='utf-8')] # Log to file
+    log_file = os.path.join(download_directory_data_logs, log_filename)
+
+    # Define log-file handlers, all sharing one formatter instance.
+    # The explicit datefmt keeps %(asctime)s on the plain strftime
+    # path instead of the default millisecond-appending formatting.
+    formatter = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S')
+    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    file_handler.setFormatter(formatter)
+    # Buffer records in memory and flush them to the log file in
+    # batches instead of writing every record individually. Errors
+    # (and logging shutdown at exit) flush immediately.
+    handlers = [logging.handlers.MemoryHandler(
+        capacity=64,
+        flushLevel=logging.ERROR,
+        target=file_handler)]
     if print_to_console:
-        handlers.append(logging.StreamHandler())    # Optional: Log to console
-    
-    
-    # Set up logging configuration
-    logging.basicConfig(
-        level=logging.DEBUG,                        # Log level can be changed as needed
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=handlers
-    )
+        console_handler = logging.StreamHandler() # Optional: Log to console
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
+
+    # Set up logging configuration by attaching the handlers to the
+    # root logger directly instead of going through basicConfig
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.DEBUG)     # Log level can be changed as needed
+    for handler in handlers:
+        root_logger.addHandler(handler)
     
     # Create a logger object for other modules to use
     logger = logging.getLogger(__name__)
-    logger.info(f'Logging started on {timestamp}')
+    logger.info('Logging started on %s', timestamp)
     return logger
 
 
 
+# Cached parser instance so repeated _parse_arguments calls
+# don't rebuild it
+_argument_parser = None
+
 def _parse_arguments() -> argparse.ArgumentParser:
     """
     Parse commandline arguments for use in the script
@@ -167,10 +140,17 @@ def _parse_arguments() -> argparse.ArgumentParser:
     Returns
     -------
     argparse.ArgumentParser:
-        Parsed commandline arguments. 
+        Parsed commandline arguments.
         Values are accessible using for example args.url
     """
-    parser = argparse.ArgumentParser(description="Youtube Archiving")
+    global _argument_parser
+    if _argument_parser is not None:
+        return _argument_parser.parse_args()
+
+    # allow_abbrev=False skips argparse's prefix matching and keeps
+    # abbreviated options from colliding with future arguments
+    parser = argparse.ArgumentParser(
+        description="Youtube Archiving", allow_abbrev=False)
 
     # Define arguments for downloading manually specified URL
     parser.add_argument(
@@ -178,11 +158,14 @@ def _parse_arguments() -> argparse.ArgumentParser:
         help="URL to download"
     )
 
-    parser.add_argument(
+    # A URL is either a playlist or a channel, so conflicting flags
+    # are rejected by argparse before any work starts
+    url_type_group = parser.add_mutually_exclusive_group()
+    url_type_group.add_argument(
         "--playlist", action="store_true", required=False,
         help="FLAG: Download playlist at given URL"
     )
-    parser.add_argument(
+    url_type_group.add_argument(
         "--channel", action="store_true", required=False,
         help="FLAG: Download channel at given URL"
     )
@@ -223,6 +206,7 @@ def _parse_arguments() -> argparse.ArgumentParser:
     )
 
     # Parse and return arguments
+    _argument_parser = parser
     return parser.parse_args()
 
 
@@ -267,6 +251,23 @@ def _print_error_and_exit(
 
 
 
+def _append_failed_urls(failed_urls:list[str]) -> None:
+    """
+    Append the collected failed-download URLs to the failed list
+    in one batched write
+
+    Parameters
+    ----------
+    failed_urls: list[str]
+        Newline-terminated URLs of failed downloads
+    """
+    if failed_urls == []:
+        return
+    with open(download_failed_list, 'a') as failed_list_file:
+        failed_list_file.writelines(failed_urls)
+
+
+
 def _move_files(
         source_directory:str,
         destination_directory:str) -> None:
@@ -281,54 +282,69 @@ def _move_files(
     destination_directory: str
         Path to destination directory
     """
-    files_to_move = os.listdir(source_directory)
+    # Snapshot the directory before renaming anything: mutating a
+    # directory while its scandir iterator is live is unspecified
+    # and can silently skip entries
+    with os.scandir(source_directory) as directory_entries:
+        files_to_move = list(directory_entries)
     for file in files_to_move:
-        src = os.path.join(source_directory, file)
-        dst = os.path.join(destination_directory, file)
-        shutil.move(src, dst)
+        dst = os.path.join(destination_directory, file.name)
+        try:
+            # Single rename syscall when source and destination
+            # are on the same filesystem
+            os.rename(file.path, dst)
+        except OSError:
+            shutil.move(file.path, dst)
 
 
 
-def _move_active_to_failed(
+def _move_active_to_in_progress_subdir(
+        subdir_key:str,
         download_number:int,
         logger:logging.Logger) -> None:
     """
-    Move files from active download directory into directory for
-    failed downloads
+    Move files from the active download directory into another
+    in_progress subdirectory (the paused or failed downloads)
 
     Parameters
     ----------
+    subdir_key: str
+        Config key of the in_progress subdirectory to move into
     download_number: int
         Index of the download URL in the list of downloaded URLs
         for logging purposes
     logger: logging.Logger
         Where to log the info/error messages for file movement
     """
-    failed_dir = config['download_directory_in_progress_failed']
-    logger.info(f'Moving failed download {download_number+1}\'s '
-                f'files to {failed_dir}')
-    
-    download_directory_in_progress_active = os.path.join(
-        config["download_directory_main"],
-        config["download_directory_in_progress"],
-        config["download_directory_in_progress_active"])
-    download_directory_in_progress_failed = os.path.join(
-        config["download_directory_main"],
-        config["download_directory_in_progress"],
-        config["download_directory_in_progress_failed"])
-    
+    target_dir = config[subdir_key]
+    logger.info('Moving download %d\'s files to %s',
+                download_number+1, target_dir)
+
+    download_directory_target = os.path.join(
+        download_directory_in_progress, target_dir)
+
     try:
         _move_files(
             download_directory_in_progress_active,
-            download_directory_in_progress_failed)
+            download_directory_target)
     except Exception as err:
         return _print_error_and_exit(
-            f'Error while moving files to {failed_dir} '
+            f'Error while moving files to {target_dir} '
             f'for download {download_number+1}: {err}',
             logger)
-    logger.info(f'Finished moving failed download '
-                f'{download_number+1}\'s files to failed files')
-    
+    logger.info('Finished moving download %d\'s files to %s',
+                download_number+1, target_dir)
+
+
+def _move_active_to_failed(
+        download_number:int,
+        logger:logging.Logger) -> None:
+    """
+    Move files from active download directory into directory for
+    failed downloads
+    """
+    _move_active_to_in_progress_subdir(
+        'download_directory_in_progress_failed', download_number, logger)
 
 
 def _move_active_to_paused(
@@ -337,39 +353,44 @@ def _move_active_to_paused(
     """
     Move files from active download directory into directory for
     paused downloads
+    """
+    _move_active_to_in_progress_subdir(
+        'download_directory_in_progress_paused', download_number, logger)
+
+
+
+def _pause_post_processing(
+        url:str,
+        download_number:int,
+        reason:str,
+        logger:logging.Logger) -> None:
+    """
+    Move files from the active download directory into the directory
+    for paused downloads and append the download's URL to the
+    to-process list, so post-processing can be finished later
 
     Parameters
     ----------
+    url: str
+        URL of the download to pause
     download_number: int
         Index of the download URL in the list of downloaded URLs
         for logging purposes
+    reason: str
+        Why the download is being paused, included in the log
     logger: logging.Logger
-        Where to log the info/error messages for file movement
+        Where to log the info messages for file movement
     """
-    paused_dir = config['download_directory_in_progress_paused']
-    logger.info(f'Moving download {download_number+1}\'s '
-                f'files to {paused_dir}')
-    
-    download_directory_in_progress_active = os.path.join(
-        config["download_directory_main"],
-        config["download_directory_in_progress"],
-        config["download_directory_in_progress_active"])
-    download_directory_in_progress_paused = os.path.join(
-        config["download_directory_main"],
-        config["download_directory_in_progress"],
-        config["download_directory_in_progress_paused"])
-    
-    try:
-        _move_files(
-            download_directory_in_progress_active,
-            download_directory_in_progress_paused)
-    except Exception as err:
-        return _print_error_and_exit(
-            f'Error while moving files to {paused_dir} '
-            f'for download {download_number+1}: {err}',
-            logger)
-    logger.info(f'Finished moving download '
-                f'{download_number+1}\'s files to {paused_dir}')
+    _move_files(
+        download_directory_in_progress_active,
+        download_directory_in_progress_paused)
+    logger.info(
+        'Download %d: Moved files into %s due to %s',
+        download_number+1, download_directory_in_progress_paused, reason)
+    with open(download_to_process_list, 'a') as paused_list_file:
+        paused_list_file.write(f'{url}\n')
+    logger.info('Download %d\'s URL added to %s',
+                download_number+1, download_to_process_list)
 
 
 
@@ -388,24 +409,9 @@ def _move_active_to_final(
     logger: logging.Logger
         Where to log the info/error messages for file movement
     """
-    logger.info(f'Download {download_number+1}: '
-                f'Moving files to final directory!')
-        
-    download_directory_in_progress_active = os.path.join(
-        config["download_directory_main"],
-        config["download_directory_in_progress"],
-        config["download_directory_in_progress_active"])
-    download_directory_videos = os.path.join(
-        config["download_directory_main"],
-        config["download_directory_videos"])
-    download_directory_subtitles = os.path.join(
-        config["download_directory_main"],
-        config["download_directory_subtitles"])
-    download_directory_data_info_json = os.path.join(
-        config["download_directory_main"],
-        config["download_directory_data"],
-        config["download_directory_data_info_json"])
-    
+    logger.info('Download %d: Moving files to final directory!',
+                download_number+1)
+
     try:
         source_dir = download_directory_in_progress_active
         files_to_move = os.listdir(source_dir)
@@ -419,18 +425,22 @@ def _move_active_to_final(
                 target_dir = download_directory_subtitles
             elif str.endswith(file, '.json'):
                 target_dir = download_directory_data_info_json
-            # Move file
+            # Move file, with a plain rename when source and
+            # destination share a filesystem
             src = os.path.join(source_dir, file)
             dst = os.path.join(target_dir, file)
-            shutil.move(src, dst)
+            try:
+                os.rename(src, dst)
+            except OSError:
+                shutil.move(src, dst)
     except Exception as err:
         return _print_error_and_exit(
             f'Download {download_number+1}: '
             f'Error while moving files to '
             f'final directories: {err}',
             logger)
-    logger.info(f'Download {download_number+1}: Finished moving '
-                f'files to their final directories.')
+    logger.info('Download %d: Finished moving '
+                'files to their final directories.', download_number+1)
 
 
 
@@ -443,10 +453,6 @@ def _remove_entry_from_download_archive(video_id:str) -> None:
     video_id:str
         Video id to remove from download_archive.txt
     """
-    download_archive_file = os.path.join(
-        config["download_directory_main"],
-        config["download_directory_data"],
-        config["download_archive_file"])
     with open(download_archive_file, 'r', encoding='utf-8') as infile:
         ids = infile.readlines()
     ids = [id.strip() for id in ids]
@@ -527,6 +533,14 @@ def main():
     The main script of this project.
     Takes the commandline arguments listed in README.md
     """
+    ### Interpret console commands
+    # Parsed before any filesystem or logger setup, so --help (and
+    # argparse errors) exit without touching the download directories
+    if len(sys.argv) == 1:
+        print("No arguments provided. Use --help for assistance.")
+        sys.argv.append("--help")
+    args = _parse_arguments()
+
     # Create environment
     try:
         _check_file_structure()
@@ -538,45 +552,46 @@ def main():
 
     # Initialize the logger for this script
     logger = _setup_logger()
-    logger.info(f'File structure checked/created successfully.')
+    logger.info('File structure checked/created successfully.')
+    logger.info('Input parameters: %s', args)
 
-    ### Interpret console commands
     video_urls = []
     video_source = None
     url_info = None
 
-    if len(sys.argv) == 1:
-        print("No arguments provided. Use --help for assistance.")
-        sys.argv.append("--help")
-    args = _parse_arguments()
-    logger.info('Input parameters:')
-    logger.info(args)
+    # Imported only after argparse had the chance to exit on --help,
+    # as yt_dlp is slow to import
+    import downloader
+    import yt_dlp
     
     # Get video URLs
     if args.file is not None:
-        with open(args.file, 'r', encoding='utf-8') as url_file:
-            for url in url_file.readlines():
-                url = url.strip()
-                video_urls.append(url)
+        url_file_text = Path(args.file).read_text(encoding='utf-8')
+        video_urls = [url.strip() for url in url_file_text.splitlines()
+                      if url.strip()]
         if video_urls in [None, []]:
-            return _print_error_and_exit(logger,
-                f'No URLs found in file {args.file}')
-    else: 
+            return _print_error_and_exit(
+                f'No URLs found in file {args.file}',
+                logger)
+    else:
         if args.url is None:
-            return _print_error_and_exit(logger,
-                'Neither URL or URL-file provided!')
-        
+            return _print_error_and_exit(
+                'Neither URL or URL-file provided!',
+                logger)
+
         if args.playlist or args.channel:
             video_urls, url_info = downloader.get_video_urls_from_url(args.url)
             if video_urls in [None, []]:
-                return _print_error_and_exit(logger,
+                return _print_error_and_exit(
                     f'No URLs found for '
-                    f'{"playlist" if args.playlist else "channel"}!')
+                    f'{"playlist" if args.playlist else "channel"}!',
+                    logger)
         else:
             video_urls = [args.url]
     
-    logger.info(f'Video URLs to download ({len(video_urls)} total):')
-    logger.info(video_urls)
+    # The individual URLs are logged one by one in the download loop,
+    # so only the total is logged here instead of the whole list
+    logger.info('Video URLs to download (%d total)', len(video_urls))
     print(f'Video URLs to download ({len(video_urls)} total)')
 
     # Determine video source
@@ -600,443 +615,394 @@ def main():
 
     
 
-    # Loading this here as it's used all over
-    download_directory_in_progress_active = os.path.join(
-        config["download_directory_main"],
-        config["download_directory_in_progress"],
-        config["download_directory_in_progress_active"])
-    download_directory_in_progress_paused = os.path.join(
-        config["download_directory_main"],
-        config["download_directory_in_progress"],
-        config["download_directory_in_progress_paused"])
-    
+    # Failed URLs are collected here and written to the failed list
+    # in one batch when the loop exits, on any path
+    failed_urls = []
+
     ### Loop over all videos to download:
-    for i, url in enumerate(video_urls):
-        url = url.replace('\n', '')
-        print(f'Download {i+1}: Starting...')
-        video_file = None
-        skip_rest = False # Used in case error occurs inside a nested loop
-        ### Download video
-        logger.info(f'Download {i+1}: {url} with aditional parameters '
-                    f'rate_limit={args.rate_limit} '
-                    f'and max_height={args.max_height}')
-        try:
-            # Get potential name of downloaded files
-            download_info = downloader.extract_info(url)
-            try: 
-                title = download_info['fulltitle']
-            except:
-                title = download_info['title']
-            video_id = download_info['id']
-            video_uploader = download_info['uploader']
-            video_upload_date = download_info['upload_date']
-            output_name = _sanitize_file_name(
-                f'YouTube ## {video_uploader} ## {video_upload_date} '
-                f'## {title} ## {video_id}.mkv')
+    try:
+        for i, url in enumerate(video_urls):
+            url = url.replace('\n', '')
+            print(f'Download {i+1}: Starting...')
+            video_file = None
+            skip_rest = False # Used in case error occurs inside a nested loop
+            ### Download video
+            logger.info('Download %d: %s with aditional parameters '
+                        'rate_limit=%s and max_height=%s',
+                        i+1, url, args.rate_limit, args.max_height)
+            try:
+                # Get potential name of downloaded files
+                download_info = downloader.extract_info(url)
+                try: 
+                    title = download_info['fulltitle']
+                except:
+                    title = download_info['title']
+                video_id = download_info['id']
+                video_uploader = download_info['uploader']
+                video_upload_date = download_info['upload_date']
+                output_name = _sanitize_file_name(
+                    f'YouTube ## {video_uploader} ## {video_upload_date} '
+                    f'## {title} ## {video_id}.mkv')
             
-            # Start actual download
-            ret_code = downloader.download(
-                url, args.rate_limit, args.max_height, output_name, verbose)
+                # Start actual download
+                ret_code = downloader.download(
+                    url, args.rate_limit, args.max_height, output_name, verbose)
         
-        # If video has already been downloaded
-        except yt_dlp.utils.ExistingVideoReached as err:
-            logger.warning(f'Download {i+1}: ({url}) Video already downloaded!')
-            logger.warning(f'Download {i+1}: {err}')
-            logger.info(
-                f'Download {i+1}: '
-                f'Checking for additional content to download')
-            # Download additional subtitles if they were not 
-            # already downloaded before. Also download a new version 
-            # of info.json to compare title and description
-
-            # Compare downloaded subtitle languages
-            video_id = _get_id_from_url(url)
-            try:
-                csv_subtitle_languages = json.loads(
-                    database.get_field_value_by_video_id(
+            # If video has already been downloaded
+            except yt_dlp.utils.ExistingVideoReached as err:
+                logger.warning('Download %d: (%s) Video already downloaded!',
+                               i+1, url)
+                logger.warning('Download %d: %s', i+1, err)
+                logger.info(
+                    'Download %d: '
+                    'Checking for additional content to download', i+1)
+                # Download additional subtitles if they were not 
+                # already downloaded before. Also download a new version 
+                # of info.json to compare title and description
+
+                # Compare downloaded subtitle languages
+                video_id = _get_id_from_url(url)
+                try:
+                    csv_subtitle_languages = json.loads(
+                        database.get_field_value_by_video_id(
+                            video_id,
+                            'subtitle_languages'))
+                except Exception as err:
+                    logger.error('Download %d: '
+                                 'Download of additional content failed', i+1)
+                    _move_active_to_failed(i, logger)
+                    continue
+                remaining_langauges = []
+                for language in config['subtitle_languages']:
+                    if language not in csv_subtitle_languages:
+                        remaining_langauges.append(language)
+                logger.info('Download %d: Additional subtitle languages '
+                            '%s still needed. Downloading...',
+                            i+1, remaining_langauges)
+                # Download additional languages and new info.json
+                ret_code = downloader.download_additional_content(
+                    url,
+                    download_directory_in_progress_active,
+                    remaining_langauges if remaining_langauges != [] else None)
+                if ret_code == 0:
+                    logger.info('Download %d: Download of additional '
+                                'content successfull', i+1)
+                    # Rename new info.json by appending current date to name
+                    new_downloaded_files = \
+                        os.listdir(download_directory_in_progress_active)
+                    for file_name in new_downloaded_files:
+                        if str.endswith(file_name, '.json'):
+                            new_info_json = os.path.join(
+                                download_directory_in_progress_active,
+                                file_name)
+                            break
+                    renamed_info_json = (new_info_json[:-5] +
+                        ' ## ' +
+                        datetime.now().strftime("%Y.%m.%d_%H.%M.%S") +
+                        new_info_json[-5:])
+                    os.rename(new_info_json, renamed_info_json)
+
+                    # Collect subtitle files
+                    subtitle_files = []
+                    for file_name in new_downloaded_files:
+                        file_extension = str.split(file_name, '.')[-1]
+                        if file_extension in ['srt', 'vtt', 'ass']:
+                            subtitle_files.append(file_name)
+
+                    # Update database with new content/info
+                    logger.info('Download %d: Updating database...', i+1)
+                    database.update_database(
                         video_id,
-                        'subtitle_languages'))
+                        video_source,
+                        renamed_info_json,
+                        subtitle_files)
+                    logger.info('Download %d: Database updated!', i+1)
+                
+                    # Move files to final directories
+                    _move_active_to_final(i, logger)
+                    continue
+                else:
+                    logger.error('Download %d: Error while downloading '
+                                 'additional content', i+1)
+                    _move_active_to_failed(i, logger)
+                    continue
+
+            except yt_dlp.postprocessor.ffmpeg.FFmpegPostProcessorError as err:
+                logger.error('Download %d: FFMPEG error! (%s)', i+1, url)
+                logger.error('Download %d: %s', i+1, err)
+
+                problematic_file_names = os.listdir(
+                    download_directory_in_progress_active)
+                for file_name in problematic_file_names:
+                    problematic_file = os.path.join(
+                        download_directory_in_progress_active,
+                        file_name)
+                    sanitized_file = os.path.join(
+                        download_directory_in_progress_active,
+                        _sanitize_file_name(file_name))
+                    os.rename(problematic_file, sanitized_file)
+
             except Exception as err:
-                logger.error(f'Download {i+1}: '
-                             f'Download of additional content failed')
+                logger.error('Download %d: Different download error! (%s)',
+                             i+1, url)
+                logger.error('Download %d: %s', i+1, err)
                 _move_active_to_failed(i, logger)
+                _remove_entry_from_download_archive(_get_id_from_url(url))
                 continue
-            remaining_langauges = []
-            for language in config['subtitle_languages']:
-                if language not in csv_subtitle_languages:
-                    remaining_langauges.append(language)
-            logger.info(f'Download {i+1}: Additional subtitle languages '
-                        f'{remaining_langauges} still needed. Downloading...')
-            # Download additional languages and new info.json
-            ret_code = downloader.download_additional_content(
-                url,
-                download_directory_in_progress_active,
-                remaining_langauges if remaining_langauges != [] else None)
-            if ret_code == 0:
-                logger.info(f'Download {i+1}: Download of additional '
-                            f'content successfull')
-                # Rename new info.json by appending current date to name
-                new_downloaded_files = \
-                    os.listdir(download_directory_in_progress_active)
-                for file_name in new_downloaded_files:
-                    if str.endswith(file_name, '.json'):
-                        new_info_json = os.path.join(
-                            download_directory_in_progress_active,
-                            file_name)
-                        break
-                renamed_info_json = (new_info_json[:-5] +
-                    ' ## ' +
-                    datetime.now().strftime("%Y.%m.%d_%H.%M.%S") +
-                    new_info_json[-5:])
-                os.rename(new_info_json, renamed_info_json)
-
-                # Collect subtitle files
-                subtitle_files = []
-                for file_name in new_downloaded_files:
-                    file_extension = str.split(file_name, '.')[-1]
-                    if file_extension in ['srt', 'vtt', 'ass']:
-                        subtitle_files.append(file_name)
-
-                # Update database with new content/info
-                logger.info(f'Download {i+1}: Updating database...')
-                database.update_database(
-                    video_id,
-                    video_source,
-                    renamed_info_json,
-                    subtitle_files)
-                logger.info(f'Download {i+1}: Database updated!')
+            
                 
-                # Move files to final directories
-                _move_active_to_final(i, logger)
-                continue
+
+            # Check if download was successful
+            if ret_code == 0:
+                logger.info('Download %d: Files downloaded successfully! (%s)',
+                            i+1, url)
+                print(f'Download {i+1}: Files downloaded successfully! ({url})')
             else:
-                logger.error(f'Download {i+1}: Error while downloading '
-                             f'additional content')
+                # If download unsucessful
+                # Logging
+                logger.error('Download %d: Unsuccessful! (%s)', i+1, url)
+                failed_urls.append(f'{url}\n')
+                logger.info('Failed download %d\'s URL added to failed list', i+1)
+
+                # Move Files from faild download into the designated directory
                 _move_active_to_failed(i, logger)
+                _remove_entry_from_download_archive(_get_id_from_url(url))
+                continue
+            
+            ### If Post-processing is set to "postponted", skip rest of the loop
+            if args.postpone_post_processing:
+                paused_dir = config['download_directory_in_progress_paused']
+                logger.info('Download %d: (%s) Post-processing postponed. '
+                            'Moving files to %s.', i+1, url, paused_dir)
+                try:
+                    _pause_post_processing(
+                        url, i, 'postponed post-processing', logger)
+                except Exception as err:
+                    return _print_error_and_exit(
+                        f'Error while moving files to {paused_dir} '
+                        f'for download {i+1}: ({url}) {err}',
+                        logger)
+                # Skip rest of loop, as it's all post processing
                 continue
 
-        except yt_dlp.postprocessor.ffmpeg.FFmpegPostProcessorError as err:
-            logger.error(f'Download {i+1}: FFMPEG error! ({url})')
-            logger.error(f'Download {i+1}: {err}')
+        
+            ### Modify/generate subtitles for downloaded Video
 
-            problematic_file_names = os.listdir(
-                download_directory_in_progress_active)
-            for file_name in problematic_file_names:
-                problematic_file = os.path.join(
-                    download_directory_in_progress_active,
-                    file_name)
-                sanitized_file = os.path.join(
-                    download_directory_in_progress_active,
-                    _sanitize_file_name(file_name))
-                os.rename(problematic_file, sanitized_file)
-
-        except Exception as err:
-            logger.error(f'Download {i+1}: Different download error! ({url})')
-            logger.error(f'Download {i+1}: {err}')
-            _move_active_to_failed(i, logger)
-            _remove_entry_from_download_archive(_get_id_from_url(url))
-            continue
-            
-                
+            # Check whether download contained autogenerated, 
+            # manual or no subtitles
 
-        # Check if download was successful
-        if ret_code == 0:
-            logger.info(f'Download {i+1}: Files downloaded successfully! ({url})')
-            print(f'Download {i+1}: Files downloaded successfully! ({url})')
-        else:
-            # If download unsucessful
-            # Logging
-            logger.error(f'Download {i+1}: Unsuccessful! ({url})')
-            download_failed_list = os.path.join(
-                config["download_directory_main"],
-                config["download_directory_data"],
-                config["download_failed_list"])
-            with open(download_failed_list, 'a') as failed_list_file:
-                failed_list_file.write(f'{url}\n')
-            logger.info(f'Failed download {i+1}\'s URL added to failed list')
-
-            # Move Files from faild download into the designated directory
-            _move_active_to_failed(i, logger)
-            _remove_entry_from_download_archive(_get_id_from_url(url))
-            continue
-            
-        ### If Post-processing is set to "postponted", skip rest of the loop
-        if args.postpone_post_processing:
-            paused_dir = config['download_directory_in_progress_paused']
-            logger.info(f'Download {i+1}: ({url}) Post-processing postponed. '
-                        f'Moving files to {paused_dir}.')
-            try:
-                _move_files(
-                    download_directory_in_progress_active,
-                    download_directory_in_progress_paused)
-            except Exception as err:
-                return _print_error_and_exit(
-                    f'Error while moving files to {paused_dir} '
-                    f'for download {i+1}: ({url}) {err}',
-                    logger)
-            logger.info(f'Download {i+1}: ({url}) '
-                        f'Finished moving files to {paused_dir}.')
-            download_paused_list = os.path.join(
-                config["download_directory_main"],
-                config["download_directory_data"],
-                config["download_to_process_list"])
-            with open(download_paused_list, 'a') as paused_list_file:
-                paused_list_file.write(f'{url}\n')
-            logger.info(f'Download {i+1}\'s URL added '
-                        f'to {download_paused_list}')
-            # Skip rest of loop, as it's all post processing
-            continue
+            # The active directory is listed once here and reused until
+            # the conversion steps below start creating new files
+            active_files = os.listdir(download_directory_in_progress_active)
 
+            # Get info.json
+            info_json = None
+            for item in active_files:
+                if str.endswith(item, '.json'):
+                    info_json = item
+                    break
+            if info_json is None:
+                logger.error('Download %d: info.json not found!', i+1)
+                _pause_post_processing(url, i, 'missing info.json', logger)
+                continue
         
-        ### Modify/generate subtitles for downloaded Video
-
-        # Check whether download contained autogenerated, 
-        # manual or no subtitles
-
-        # Get info.json
-        info_json = None
-        for item in os.listdir(download_directory_in_progress_active):
-            if str.endswith(item, '.json'):
-                info_json = item
-                break
-        if info_json is None:
-            logger.error(f'Download {i+1}: info.json not found!')
-            _move_files(
+            # Load info.json
+            info_json = os.path.join(
                 download_directory_in_progress_active,
-                download_directory_in_progress_paused)
-            logger.info(
-                f'Download {i+1}: Moved files into '
-                f'{download_directory_in_progress_paused} '
-                f'due to missing video file')
-            
-            download_paused_list = os.path.join(
-                config["download_directory_main"],
-                config["download_directory_data"],
-                config["download_to_process_list"])
-            with open(download_paused_list, 'a') as paused_list_file:
-                paused_list_file.write(f'{url}\n')
-            logger.info(f'Download {i+1}\'s URL added '
-                        f'to {download_paused_list}')
-            continue
-        
-        # Load info.json
-        info_json = os.path.join(
-            download_directory_in_progress_active,
-            info_json)
-        with open(info_json, 'r', encoding='utf-8') as info_file:
-            info_data = json.load(info_file)
-
-        # Preprocessing for caption analysis
-        subtitle_langs = config['subtitle_languages']
-        subtitle_langs_covered = list.copy(subtitle_langs)
-        next_step_required = True
-
-        # Downloaded video has Manual subtitles
-        if info_data['subtitles'] != {}:
-            # Check that downloaded video has all required
-            # languages as manual subtitles
-            for sub_id, sub_info in info_data['subtitles'].items():
-                for lang_idx, language in enumerate(subtitle_langs):
-                    if str.startswith(sub_id, language):
-                        subtitle_langs_covered[lang_idx] = None
-                        break
-            subtitle_langs_covered = [lang for lang in subtitle_langs_covered 
-                                           if lang is not None]
-            # All required langauges available as manual captions
-            if subtitle_langs_covered == []:
-                next_step_required = False
-        
-        # Downloaded video has Automatic captions and downloaded 
-        # video did not have all required languages as manual subtitles
-        if next_step_required and info_data['automatic_captions'] != {}:
-            # Check that downloaded video has all required/remaining
-            # languages as manual subtitles
-            auto_captions_found = []
-            subtitle_langs = subtitle_langs_covered
-            for sub_id, sub_info in info_data['automatic_captions'].items():
-                for lang_idx, language in enumerate(subtitle_langs):
-                    if sub_id == language:
-                        subtitle_langs_covered[lang_idx] = None
-                        auto_captions_found.append(language)
-                        break
-            subtitle_langs_covered = [lang for lang in subtitle_langs_covered 
-                                           if lang is not None]
-            # All required langauges available as automatic captions
-            if subtitle_langs_covered == []:
-                next_step_required = False
-
-            file_list = os.listdir(download_directory_in_progress_active)
-
-
-            # Generate converted captions for automatic captions
-            for language in auto_captions_found:
-                # Check that subtitle file is actually available for langauge
-                subtitle_file = None
-                for file in file_list:
-                    if str.endswith(file[:-4], language):
-                        subtitle_file = file
-                        break
-                if subtitle_file is None:
-                    continue
-                # Convert subtitle file into its derivatives
-
-                # Importing here to prevent unneccessary slowdown
-                # if the import is unused
-                print(f'Download {i+1}: Converting Subtitles ({language})...')
-                import subtitles_convert_existing as sub_convert
-                subtitle_file = os.path.join(
-                    download_directory_in_progress_active,
-                    subtitle_file)
-                                
-                if language == 'en':
-                    debug_info = sub_convert.generate_converted_subtitles(
+                info_json)
+            with open(info_json, 'r', encoding='utf-8') as info_file:
+                info_data = json.load(info_file)
+
+            # Preprocessing for caption analysis
+            subtitle_langs = config['subtitle_languages']
+            # Required languages not yet covered by downloaded subtitles
+            subtitle_langs_covered = list.copy(subtitle_langs)
+            # If no subtitle languages are configured, all subtitle
+            # handling can be skipped entirely
+            next_step_required = subtitle_langs != []
+
+            # Downloaded video has Manual subtitles
+            if next_step_required and info_data['subtitles'] != {}:
+                # Determine which required languages are covered by
+                # manual subtitles
+                manual_langs = {language
+                                for sub_id in info_data['subtitles']
+                                for language in subtitle_langs_covered
+                                if str.startswith(sub_id, language)}
+                subtitle_langs_covered = [lang for lang in subtitle_langs_covered
+                                               if lang not in manual_langs]
+                # All required langauges available as manual captions
+                if subtitle_langs_covered == []:
+                    next_step_required = False
+
+            # Downloaded video has Automatic captions and downloaded
+            # video did not have all required languages as manual subtitles
+            if next_step_required and info_data['automatic_captions'] != {}:
+                # Determine which remaining languages are covered by
+                # automatic captions (exact caption-id match)
+                auto_captions_found = [language
+                                       for language in subtitle_langs_covered
+                                       if language in
+                                          info_data['automatic_captions']]
+                subtitle_langs_covered = [lang for lang in subtitle_langs_covered
+                                               if lang not in auto_captions_found]
+                # All required langauges available as automatic captions
+                if subtitle_langs_covered == []:
+                    next_step_required = False
+
+                # Map each found language to its subtitle file in a
+                # single pass over the directory listing
+                subtitle_file_by_language = {}
+                for file in active_files:
+                    file_stem, file_extension = os.path.splitext(file)
+                    if file_extension not in ['.srt', '.vtt', '.ass']:
+                        continue
+                    for language in auto_captions_found:
+                        if str.endswith(file_stem, f'.{language}'):
+                            subtitle_file_by_language.setdefault(language, file)
+                            break
+
+                # Generate converted captions for automatic captions
+                for language in auto_captions_found:
+                    # Check that subtitle file is actually available for langauge
+                    subtitle_file = subtitle_file_by_language.get(language)
+                    if subtitle_file is None:
+                        continue
+                    # Convert subtitle file into its derivatives
+
+                    # Importing here to prevent unneccessary slowdown
+                    # if the import is unused
+                    print(f'Download {i+1}: Converting Subtitles ({language})...')
+                    import subtitles_convert_existing as sub_convert
+                    subtitle_file = os.path.join(
+                        download_directory_in_progress_active,
                         subtitle_file)
-                else:
-                    # If language en reformatting ML-model doesn't apply
-                    debug_info = sub_convert.generate_converted_subtitles(
-                        subtitle_file, True, False, False)
-                    
-                error_occured = False
-                for key, message in debug_info.items():
-                    if str.startswith(message, 'Error'):
-                        logger.error(f'Download {i+1}: {key}: {message}')
-                        error_occured = True
+                                
+                    if language == 'en':
+                        debug_info = sub_convert.generate_converted_subtitles(
+                            subtitle_file)
                     else:
-                        logger.info(f'Download {i+1}: {key}: {message}')
-                if error_occured:
-                    _move_active_to_paused(i, logger)
-                    _remove_entry_from_download_archive(_get_id_from_url(url))
-                    skip_rest = True
-                    break
-        if skip_rest:
-            continue
+                        # If language en reformatting ML-model doesn't apply
+                        debug_info = sub_convert.generate_converted_subtitles(
+                            subtitle_file, True, False, False)
+                    
+                    error_occured = False
+                    for key, message in debug_info.items():
+                        if str.startswith(message, 'Error'):
+                            logger.error('Download %d: %s: %s', i+1, key, message)
+                            error_occured = True
+                        else:
+                            logger.info('Download %d: %s: %s', i+1, key, message)
+                    if error_occured:
+                        _move_active_to_paused(i, logger)
+                        _remove_entry_from_download_archive(_get_id_from_url(url))
+                        skip_rest = True
+                        break
+            if skip_rest:
+                continue
 
-        # Downloaded video does NOT have automatic or manual captions
-        # If this is the case and the missing langauge is English,
-        # Generate new caption using ML-model.
-        # This script does not have multiple models for different Languages
-        if next_step_required and 'en' in subtitle_langs_covered:
-            # Find video file
-            file_list = os.listdir(download_directory_in_progress_active)
-            video_file = None
-            found = False
-            for video_file_format in ['mkv', 'mp4', 'webm']:
-                for file in file_list:
-                    if str.endswith(file, video_file_format):
-                        video_file = file
+            # Downloaded video does NOT have automatic or manual captions
+            # If this is the case and the missing langauge is English,
+            # Generate new caption using ML-model.
+            # This script does not have multiple models for different Languages
+            if next_step_required and 'en' in subtitle_langs_covered:
+                # Find video file
+                file_list = os.listdir(download_directory_in_progress_active)
+                video_file = None
+                found = False
+                for video_file_format in ['mkv', 'mp4', 'webm']:
+                    for file in file_list:
+                        if str.endswith(file, video_file_format):
+                            video_file = file
+                            break
+                    if found:
                         break
-                if found:
-                    break
-            # If video file found, generate new Subtitles
-            video_file_path = os.path.join(
-                download_directory_in_progress_active,
-                video_file)
-            if video_file_path is not None and os.path.exists(video_file_path):
-                # Importing here to prevent unneccessary slowdown
-                # if the import is unused
-                print(f'Download {i+1}: Generating new Subtitles...')
-                import subtitles_generate_new as sub_generate
-                debug_info = sub_generate.generate_new_subtitles(
-                    video_file_path)
-                error_occured = False
-                for key, message in debug_info.items():
-                    if str.startswith(message, 'Error'):
-                        logger.error(f'Download {i+1}: {key}: {message}')
-                        error_occured = True
-                    else:
-                        logger.info(f'Download {i+1}: {key}: {message}')
-                if error_occured:
-                    _move_active_to_paused(i, logger)
-                    _remove_entry_from_download_archive(_get_id_from_url(url))
-                    skip_rest = True
-                    break
-        if skip_rest:
-            continue
+                # If video file found, generate new Subtitles
+                video_file_path = os.path.join(
+                    download_directory_in_progress_active,
+                    video_file)
+                if video_file_path is not None and os.path.exists(video_file_path):
+                    # Importing here to prevent unneccessary slowdown
+                    # if the import is unused
+                    print(f'Download {i+1}: Generating new Subtitles...')
+                    import subtitles_generate_new as sub_generate
+                    debug_info = sub_generate.generate_new_subtitles(
+                        video_file_path)
+                    error_occured = False
+                    for key, message in debug_info.items():
+                        if str.startswith(message, 'Error'):
+                            logger.error('Download %d: %s: %s', i+1, key, message)
+                            error_occured = True
+                        else:
+                            logger.info('Download %d: %s: %s', i+1, key, message)
+                    if error_occured:
+                        _move_active_to_paused(i, logger)
+                        _remove_entry_from_download_archive(_get_id_from_url(url))
+                        skip_rest = True
+                        break
+            if skip_rest:
+                continue
 
-        ### Subtitle embedding 
-        # Embed subtitle files into video file
+            ### Subtitle embedding 
+            # Embed subtitle files into video file
         
-        # Retrieve video and subtitle files
-        video_file = None
-        subtitle_files = []
-        downloaded_files = os.listdir(
-            download_directory_in_progress_active)
-        for file in downloaded_files:
-            file_extension = str.split(file, '.')[-1]
-            if file_extension in ['mkv', 'mp4', 'webm']:
-                video_file = file
-            elif file_extension in ['srt', 'vtt', 'ass']:
-                subtitle_files.append(file)
+            # Retrieve video and subtitle files
+            video_file = None
+            subtitle_files = []
+            downloaded_files = os.listdir(
+                download_directory_in_progress_active)
+            for file in downloaded_files:
+                file_extension = str.split(file, '.')[-1]
+                if file_extension in ['mkv', 'mp4', 'webm']:
+                    video_file = file
+                elif file_extension in ['srt', 'vtt', 'ass']:
+                    subtitle_files.append(file)
+
+            # Check video and subtitles are available
+            if video_file is None:
+                logger.error(
+                    'Download %d: No video file found to embed subs', i+1)
+                _pause_post_processing(url, i, 'missing video file', logger)
+                continue
+            if subtitle_files == [] and config['subtitle_languages'] != []:
+                logger.error(
+                    'Download %d: No subtitle files found to embed subs', i+1)
+                _pause_post_processing(url, i, 'missing subtitle files', logger)
+                continue
 
-        # Check video and subtitles are available
-        if video_file is None:
-            logger.error(
-                f'Download {i+1}: No video file found to embed subs')
-            _move_files(
-                download_directory_in_progress_active,
-                download_directory_in_progress_paused)
-            logger.info(
-                f'Download {i+1}: Moved files into '
-                f'{download_directory_in_progress_paused} '
-                f'due to missing video file')
-            
-            download_paused_list = os.path.join(
-                config["download_directory_main"],
-                config["download_directory_data"],
-                config["download_to_process_list"])
-            with open(download_paused_list, 'a') as paused_list_file:
-                paused_list_file.write(f'{url}\n')
-            logger.info(f'Download {i+1}\'s URL added '
-                        f'to {download_paused_list}')
-            continue
-        if subtitle_files == []:
-            logger.error(
-                f'Download {i+1}: No subtitle files found to embed subs')
-            _move_files(
-                download_directory_in_progress_active,
-                download_directory_in_progress_paused)
-            logger.info(
-                f'Download {i+1}: Moved files into '
-                f'{download_directory_in_progress_paused} '
-                f'due to missing subtitle files')
-            
-            download_paused_list = os.path.join(
-                config["download_directory_main"],
-                config["download_directory_data"],
-                config["download_to_process_list"])
-            with open(download_paused_list, 'a') as paused_list_file:
-                paused_list_file.write(f'{url}\n')
-            logger.info(f'Download {i+1}\'s URL added '
-                        f'to {download_paused_list}')
-            continue
-        
-        # Embed subtitles into video (overwriting the original video)
-        video_file_path = os.path.join(
-            download_directory_in_progress_active,
-            video_file)
-        subtitle_file_paths = []
-        for subtitle_file_name in subtitle_files:
-            subtitle_file_paths.append(os.path.join(
+            # Embed subtitles into video (overwriting the original video)
+            video_file_path = os.path.join(
                 download_directory_in_progress_active,
-                subtitle_file_name))
-
-        print(f'Download {i+1}: Embedding subtitles...')
-        subtitles_embedding.add_subtitle_streams(
-            video_file_path,
-            subtitle_file_paths,
-            None)
-
-        ### Save information to central database
-        database.add_to_database(
-            info_json,
-            video_file,
-            subtitle_file_paths,
-            video_source)
-
-        ### Move finalized product to final directories
-        logger.info(f'Download {i+1}: ({url}) Post processing finished!')
-        _move_active_to_final(i, logger)
-        print(f'Download {i+1}: Finished!')
+                video_file)
+            subtitle_file_paths = []
+            for subtitle_file_name in subtitle_files:
+                subtitle_file_paths.append(os.path.join(
+                    download_directory_in_progress_active,
+                    subtitle_file_name))
+
+            if subtitle_file_paths != []:
+                print(f'Download {i+1}: Embedding subtitles...')
+                subtitles_embedding.add_subtitle_streams(
+                    video_file_path,
+                    subtitle_file_paths,
+                    None)
+
+            ### Save information to central database
+            database.add_to_database(
+                info_json,
+                video_file,
+                subtitle_file_paths,
+                video_source)
+
+            ### Move finalized product to final directories
+            logger.info('Download %d: (%s) Post processing finished!', i+1, url)
+            _move_active_to_final(i, logger)
+            print(f'Download {i+1}: Finished!')
+
+    finally:
+        # Flush the collected failures on every exit path, so an
+        # unhandled error mid-loop cannot discard them
+        _append_failed_urls(failed_urls)
 
 
 
@@ -1,20 +1,20 @@
-import json
+import functools
 import logging
 import os
 import sys
 
 import ffmpeg
 
-# Load config
-config_file_path = 'config/config.json'
-with open(config_file_path, 'r') as config_file:
-    config = json.load(config_file)
+from config_loader import config
 
 
 
+@functools.lru_cache(maxsize=None)
 def _get_subtitle_language(subtitle_file:str) -> str:
     """
-    Reads out the 'language' from a subtitle file
+    Reads out the 'language' from a subtitle file.
+    Results are memoized per path, as the same file is looked up
+    both for ordering and for the language metadata.
 
     Example: 'name.en.dir_iter.vtt' would return 'en.dir_iter'
     Example: 'name.en.vtt' would return 'en'
@@ -29,7 +29,9 @@ def _get_subtitle_language(subtitle_file:str) -> str:
     str:
         'language' of the input subtitle file according to its title
     """
-    split_sub_file = str.split(subtitle_file, '.')
+    # Only the last three dot-separated parts can matter, so the
+    # rest of the path is left unsplit
+    split_sub_file = str.rsplit(subtitle_file, '.', 3)
     language = split_sub_file[-2]
     if language in config["subtitle_languages"]:
         return language
@@ -55,26 +57,27 @@ def _order_subtitles(subtitle_files:list[str]) -> list[str]:
     list[str]:
         Ordered list of the subtitle files from the input
     """
-    # Find "language" of each subtitle file
-    subtitle_languages = [_get_subtitle_language(sf) for sf in subtitle_files]
+    # Map each "language" to the first subtitle file carrying it
+    file_index_by_language = {}
+    for index, subtitle_file in enumerate(subtitle_files):
+        language = _get_subtitle_language(subtitle_file)
+        if language not in file_index_by_language:
+            file_index_by_language[language] = index
 
     # Assign each subtitle file a priority index
     pritority_idices = []
     for lang in config["subtitle_languages"]:
         for lang_prio in config["subtitle_priority"]:
             # Resolve language_to_check
-            language_to_check = None
             if lang_prio == 'default':
                 # Only uses main language abbreviation for default youtube subs
                 language_to_check = lang
             else:
                 language_to_check = f'{lang}.{lang_prio}'
             # Check if language is available
-            try:
-                index = subtitle_languages.index(language_to_check)
+            index = file_index_by_language.get(language_to_check)
+            if index is not None:
                 pritority_idices.append(index)
-            except:
-                continue
     # Return ordered list of subtitle files
     return [subtitle_files[idx] for idx in pritority_idices]
         
@@ -102,6 +105,11 @@ def add_subtitle_streams(
         Path of output video file. If not given, 
         input file will be overwritten instead
     """
+    # Without subtitle files the re-mux would only copy the video
+    # into itself, so it can be skipped entirely
+    if subtitle_files in [None, []]:
+        return
+
     # If no output file is defined, overwrite input file
     if output_file is None or output_file == video_file:
         output_file = video_file[:-4] + '.temp' + video_file[-4:]
@@ -118,14 +126,13 @@ def add_subtitle_streams(
     input_audio = input_ffmpeg['a']
     input_subtitles = [subtitle['s'] for subtitle in input_ffmpeg_subtitles]
 
-    # Define langauge metadata
+    # Define langauge metadata and subtitle codec per stream
     lang_metadata = {}
+    scodec_dict = {}
     for i, sub_file in enumerate(subtitle_files):
         language = _get_subtitle_language(sub_file)
         lang_metadata[f'metadata:s:s:{i}'] = f'language={language}'
-
-    scodec_dict = {f'scodec:s:{i}': 'webvtt' 
-                   for i in range(len(subtitle_files))}
+        scodec_dict[f'scodec:s:{i}'] = 'webvtt'
 
     output_ffmpeg = ffmpeg.output(
         input_video, input_audio, 
@@ -141,9 +148,8 @@ def add_subtitle_streams(
 
     ffmpeg.run(output_ffmpeg)
 
-    # Overwrite previous video file
-    os.remove(video_file)
-    os.rename(output_file, video_file)
+    # Overwrite previous video file in a single atomic rename
+    os.replace(output_file, video_file)
 
 
 